@@ -0,0 +1,832 @@
+import os
+import re
+import sys
+import shutil
+import zipfile
+import hashlib
+import tempfile
+import threading
+import otbApplication
+import concurrent.futures
+
+from pathlib import Path
+from datetime import datetime
+from functools import lru_cache
+
+from src.utility.bbox import BBox
+
+# compile filename patterns once at import time
+_DT_RE = re.compile( '_(\d{15})_' )
+_TILE_RE = re.compile( '_R(\d)C(\d)' )
+
+@lru_cache( maxsize=1024 )
+def _sceneDateTime( basename ):
+
+    """
+    parse acquisition datetime from basename
+    """
+
+    dt = None
+
+    # parse 15 digit datetime field
+    m = _DT_RE.search( basename )
+    if m:
+        dt = datetime.strptime( m.group( 1 ), '%Y%m%d%H%M%S%f' )
+
+    return dt
+
+
+@lru_cache( maxsize=1024 )
+def _tileCoordinates( basename ):
+
+    """
+    parse tile row and column indices from basename
+    """
+
+    coords = None
+
+    # parse tile row / column field
+    m = _TILE_RE.search( basename )
+    if m:
+        coords = ( int( m.group( 1 ) ), int( m.group( 2 ) ) )
+
+    return coords
+
+
+# calibration outputs cached across runs - content addressed
+_CAL_CACHE_PATH = os.environ.get( 'GLA_CAL_CACHE', os.path.join( tempfile.gettempdir(), 'gla-cal-cache' ) )
+
+
+def _calCachePathname( image, level, milli ):
+
+    """
+    content-addressed cache pathname for calibrated image
+    """
+
+    # first megabyte distinguishes dimap tiffs - unique tile ids embedded in header
+    with open( image, 'rb' ) as f:
+        digest = hashlib.sha1( f.read( 1<<20 ) ).hexdigest()[ :16 ]
+
+    return os.path.join( _CAL_CACHE_PATH, f'{digest}_{level}_{int( milli )}.TIF' )
+
+
+def _mosaicCachePathname( images, level, milli ):
+
+    """
+    content-addressed cache pathname for calibrated band mosaic
+    """
+
+    # combine per-tile digests - any tile change invalidates mosaic
+    digest = hashlib.sha1()
+    for image in sorted( images ):
+
+        with open( image, 'rb' ) as f:
+            digest.update( hashlib.sha1( f.read( 1<<20 ) ).digest() )
+
+    return os.path.join( _CAL_CACHE_PATH, f'{digest.hexdigest()[ :16 ]}_{level}_{int( milli )}_MOSAIC.TIF' )
+
+
+def _linkFile( src, dst ):
+
+    """
+    hardlink file falling back to copy across devices
+    """
+
+    try:
+        os.link( src, dst )
+    except OSError:
+        shutil.copyfile( src, dst )
+
+    return
+
+
+def _out( pathname ):
+
+    """
+    append tuned gdal creation options to output pathname
+    """
+
+    return pathname + ( '?&gdal:co:TILED=YES&gdal:co:BLOCKXSIZE=512&gdal:co:BLOCKYSIZE=512'
+                        '&gdal:co:COMPRESS=DEFLATE&gdal:co:PREDICTOR=2'
+                        '&gdal:co:NUM_THREADS=ALL_CPUS&gdal:co:BIGTIFF=IF_SAFER' )
+
+
+class _LogRedirect:
+
+    """
+    splice process-level stdout and stderr into log file at descriptor level
+    """
+
+    # splice shared between nested and concurrent contexts
+    _lock = threading.Lock()
+    _count = 0
+
+    def __init__( self, log_pathname ):
+
+        # log file opened append only on first splice
+        self._log_pathname = log_pathname
+        return
+
+
+    def __enter__( self ):
+
+        with _LogRedirect._lock:
+
+            # first context in splices pipe under descriptors 1 and 2
+            _LogRedirect._count += 1
+            if _LogRedirect._count == 1:
+
+                os.makedirs( os.path.dirname( self._log_pathname ), exist_ok=True )
+                _LogRedirect._log_fd = os.open( self._log_pathname, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644 )
+
+                # preserve original descriptors
+                _LogRedirect._saved = [ os.dup( fd ) for fd in ( 1, 2 ) ]
+                _LogRedirect._read_fd, _LogRedirect._write_fd = os.pipe()
+
+                os.dup2( _LogRedirect._write_fd, 1 )
+                os.dup2( _LogRedirect._write_fd, 2 )
+
+                # drain pipe into log on background thread - bypasses text encoding
+                _LogRedirect._thread = threading.Thread( target=_LogRedirect._drain )
+                _LogRedirect._thread.start()
+
+        return self
+
+
+    @staticmethod
+    def _drain():
+
+        # stream contiguous byte chunks straight to log descriptor
+        while True:
+
+            chunk = os.read( _LogRedirect._read_fd, 65536 )
+            if not chunk:
+                break
+
+            os.write( _LogRedirect._log_fd, chunk )
+
+        return
+
+
+    def __exit__( self, *args ):
+
+        with _LogRedirect._lock:
+
+            # last context out restores descriptors and stops drain
+            _LogRedirect._count -= 1
+            if _LogRedirect._count == 0:
+
+                sys.stdout.flush(); sys.stderr.flush()
+
+                os.dup2( _LogRedirect._saved[ 0 ], 1 ); os.dup2( _LogRedirect._saved[ 1 ], 2 )
+                os.close( _LogRedirect._write_fd )
+
+                _LogRedirect._thread.join()
+                for fd in _LogRedirect._saved + [ _LogRedirect._read_fd, _LogRedirect._log_fd ]:
+                    os.close( fd )
+
+        return False
+
+
+def _findImages( root, platform, _id ):
+
+    """
+    scan fixed two-level scene layout for platform imagery
+    """
+
+    # prefix shared by image folders and files
+    prefix = f'IMG_{platform}_{_id}_'
+
+    # anchored image filename pattern - excludes preview and quicklook imagery during walk
+    img_re = re.compile( rf'^IMG_{re.escape( platform )}_{_id}_.*\.TIF$', re.IGNORECASE )
+
+    with os.scandir( root ) as folders:
+        for folder in folders:
+
+            # descend into matching image folders only
+            if folder.name.startswith( prefix ) and folder.is_dir( follow_symlinks=False ):
+
+                with os.scandir( folder.path ) as entries:
+                    for entry in entries:
+
+                        # direntry cache avoids extra stat per candidate file
+                        if img_re.match( entry.name ) and entry.is_file():
+                            yield entry.path
+
+
+def _initCalibration( ram ):
+
+    """
+    initialise calibration worker process
+    """
+
+    # constrain per-worker otb memory footprint
+    os.environ[ 'OTB_MAX_RAM_HINT' ] = str( ram )
+    return
+
+
+def _calibrateImage( args ):
+
+    """
+    calibrate single image in worker process
+    """
+
+    image, out_pathname, level, milli, log_pathname, cache_pathname = args
+
+    # initialise optical calibration application
+    app = otbApplication.Registry.CreateApplication( 'OpticalCalibration' )
+
+    app.SetParameterString( 'in', image )
+    app.SetParameterString( 'out', _out( out_pathname ) )
+    app.SetParameterString( 'level', level )
+    app.SetParameterValue( 'milli', milli )
+
+    # execute application with output redirected to log
+    with _LogRedirect( log_pathname ):
+        app.ExecuteAndWriteOutput()
+
+    # publish result into calibration cache
+    if not os.path.exists( cache_pathname ):
+
+        os.makedirs( os.path.dirname( cache_pathname ), exist_ok=True )
+        _linkFile( out_pathname, cache_pathname )
+
+    return out_pathname
+
+
+class Dataset:
+
+    # otb applications cached per thread - reusable across scenes but not thread safe
+    _app_store = threading.local()
+
+    # srtm download requests already issued this session
+    _srtm_cache = set()
+
+    def __init__( self, scene, dem_path=None, geoid_pathname=None, roi=None, ram=4096, log_path=tempfile.gettempdir() ):
+
+        """
+        constructor
+        """
+
+        # initialise member variables
+        self._scene = scene
+        self._ram = ram
+
+        # optional dem and geoid for orthorectification
+        self._dem_path = dem_path
+        self._geoid_pathname = geoid_pathname
+
+        # optional roi bounding box
+        self._roi = BBox( roi ) if roi is not None else None
+
+        # parse acquisition datetime from scene name
+        self._datetime = self.getDateTime( os.path.basename( scene ) )
+
+        # log created lazily on first redirected write
+        self._log_pathname = os.path.join( log_path, os.path.basename( scene ).replace( '.zip', '.log' ) )
+
+        return
+
+
+    def _app( self, name ):
+
+        """
+        create or reuse cached otb application
+        """
+
+        cache = getattr( Dataset._app_store, 'cache', None )
+        if cache is None:
+            cache = Dataset._app_store.cache = {}
+
+        # create application on first use - registry load is expensive
+        app = cache.get( name )
+        if app is None:
+            cache[ name ] = app = otbApplication.Registry.CreateApplication( name )
+        else:
+
+            # clear values assigned by previous run
+            for key in app.GetParametersKeys():
+                if app.HasUserValue( key ):
+                    app.ClearValue( key )
+
+        return app
+
+
+    def getDateTime( self, filename ):
+
+        """
+        parse acquisition datetime from filename
+        """
+
+        # memoised on basename - repeated across tiles of scene
+        return _sceneDateTime( os.path.basename( filename ) )
+
+
+    def getPlatform( self, filename ):
+
+        """
+        parse platform name from filename
+        """
+
+        platform = None
+
+        # parse platform specific pattern
+        m = self._platform_pattern.search( filename )
+        if m:
+            platform = str( m.group( 0 ) )
+
+        return platform
+
+
+    def getTile( self, filename ):
+
+        """
+        parse tile name from filename
+        """
+
+        tile = None
+
+        # parse tile row / column field
+        m = _TILE_RE.search( filename )
+        if m:
+            tile = str( m.group( 0 ) ).lstrip( '_' )
+
+        return tile
+
+
+    def getTileCoordinates( self, filename ):
+
+        """
+        parse tile row and column indices from filename
+        """
+
+        # memoised on basename - repeated across tiles of scene
+        return _tileCoordinates( os.path.basename( filename ) )
+
+
+    def getSubPath( self ):
+
+        """
+        get storage sub-path derived from scene name
+        """
+
+        return os.path.join( self._platform, self._datetime.strftime( '%Y%m%d_%H%M%S' ) )
+
+
+    def extractZip( self, out_path ):
+
+        """
+        extract scene archive contents into path
+        """
+
+        # skip extraction when archive contents already unpacked
+        if os.path.exists( out_path ) and len( os.listdir( out_path ) ) > 0:
+            return out_path
+
+        # create out path if required
+        os.makedirs( out_path, exist_ok=True )
+
+        # unpack archive contents
+        with zipfile.ZipFile( self._scene ) as zf:
+            zf.extractall( out_path )
+
+        return out_path
+
+
+    def setLogPathname( self, log_pathname ):
+
+        """
+        override scene log destination
+        """
+
+        self._log_pathname = log_pathname
+        return
+
+
+    def getTmpPath( self ):
+
+        """
+        get scene specific temporary path alongside archive
+        """
+
+        # sub-folder per scene - archives commonly share a directory
+        return os.path.join( os.path.dirname( self._scene ), 'tmp', os.path.splitext( os.path.basename( self._scene ) )[ 0 ] )
+
+
+    def getImageLists( self, path ):
+
+        """
+        get multispectral and panchromatic image lists
+        """
+
+        images = {}
+
+        # locate imagery for each spectral mode
+        for _id in [ 'MS', 'P' ]:
+
+            image_list = sorted( _findImages( path, self._platform, _id ) )
+            if not image_list:
+
+                # nested package layouts - dimap deliveries bury IMG folders under PROD/VOL at any depth
+                pattern = f'IMG_{self._platform}_{_id}_*/IMG_{self._platform}_{_id}_*.TIF'
+                image_list = sorted( str( pathname ) for pathname in Path( path ).rglob( pattern ) )
+
+            images[ _id ] = image_list
+
+        return images
+
+
+    def getSrtmKey( self, images ):
+
+        """
+        session cache key for srtm download request
+        """
+
+        return ( self._dem_path, tuple( sorted( os.path.basename( image ) for image in images ) ) )
+
+
+    def markSrtmTiles( self, images ):
+
+        """
+        record srtm download request as satisfied for session
+        """
+
+        Dataset._srtm_cache.add( self.getSrtmKey( images ) )
+        return
+
+
+    def getSrtmTiles( self, images ):
+
+        """
+        download srtm tiles encompassing image footprints
+        """
+
+        # skip repeat download requests within session
+        key = self.getSrtmKey( images )
+        if key in Dataset._srtm_cache:
+            return
+
+        # create dem path if required
+        os.makedirs( self._dem_path, exist_ok=True )
+
+        # initialise srtm download application
+        app = self._app( 'DownloadSRTMTiles' )
+
+        app.SetParameterStringList( 'il', images )
+        app.SetParameterString( 'tiledir', self._dem_path )
+
+        # execute application with output redirected to log
+        with _LogRedirect( self._log_pathname ):
+            app.ExecuteAndWriteOutput()
+
+        Dataset._srtm_cache.add( key )
+        return
+
+
+    def getCalibratedImages( self, images, out_path, level='toa', milli=True ):
+
+        """
+        calibrate raw imagery with otb optical calibration application
+        """
+
+        # create out path once before loop
+        os.makedirs( out_path, exist_ok=True )
+
+        out_images = []; work = []
+        for image in images:
+
+            # schedule calibration unless output already exists
+            stem, ext = os.path.splitext( os.path.basename( image ) )
+            out_pathname = os.path.join( out_path, f'{stem}_CAL{ext}' )
+
+            if not os.path.exists( out_pathname ):
+
+                # adopt cached output from previous run - hardlink avoids recompute and copy
+                cache_pathname = _calCachePathname( image, level, milli )
+                if os.path.exists( cache_pathname ):
+                    _linkFile( cache_pathname, out_pathname )
+                else:
+                    work.append( ( image, out_pathname, level, milli, self._log_pathname, cache_pathname ) )
+
+            out_images.append( out_pathname )
+
+        # calibrate tiles concurrently - per-tile otb pipelines are independent
+        if work:
+
+            workers = min( len( work ), os.cpu_count() )
+            with concurrent.futures.ProcessPoolExecutor(    max_workers=workers,
+                                                            initializer=_initCalibration,
+                                                            initargs=( max( self._ram // workers, 256 ), ) ) as executor:
+                list( executor.map( _calibrateImage, work ) )
+
+        return out_images
+
+
+    def getMosaicPathname( self, images, out_path ):
+
+        """
+        predict mosaic pathname from first tile pathname
+        """
+
+        return os.path.join( out_path, os.path.basename( min( images ) ).replace( '_R1C1', '_MOSAIC' ) )
+
+
+    def getBandMosaicImage( self, images, tmp_path ):
+
+        """
+        calibrate and mosaic image tiles for single spectral band
+        """
+
+        # short-circuit on cached mosaic from earlier run
+        mosaic_path = os.path.join( tmp_path, 'mosaic' )
+        out_pathname = self.getMosaicPathname( [ f'{os.path.splitext( os.path.basename( image ) )[ 0 ]}_CAL.TIF' for image in images ], mosaic_path )
+
+        if os.path.exists( out_pathname ):
+            return out_pathname
+
+        # stream tile calibration directly into mosaic
+        return self.getCalibratedMosaicImage( images, mosaic_path )
+
+
+    def getCalibratedMosaicImage( self, images, out_path, level='toa', milli=True ):
+
+        """
+        stream tile calibration directly into mosaic with in-memory otb pipeline
+        """
+
+        # parse tile coordinates in single regex pass
+        tiles = [ ( int( m.group( 1 ) ), int( m.group( 2 ) ), image ) for image in images for m in [ _TILE_RE.search( os.path.basename( image ) ) ] if m ]
+
+        nrows = max( tile[ 0 ] for tile in tiles )
+        ncols = max( tile[ 1 ] for tile in tiles )
+
+        images = [ tile[ 2 ] for tile in sorted( tiles ) ]
+
+        # create out path if required
+        os.makedirs( out_path, exist_ok=True )
+
+        # construct mosaic pathname matching tile fusion of calibrated tiles
+        out_pathname = self.getMosaicPathname( [ f'{os.path.splitext( os.path.basename( image ) )[ 0 ]}_CAL.TIF' for image in images ], out_path )
+        if not os.path.exists( out_pathname ):
+
+            # adopt cached mosaic from previous run under different tmp path
+            cache_pathname = _mosaicCachePathname( images, level, milli )
+            if os.path.exists( cache_pathname ):
+
+                _linkFile( cache_pathname, out_pathname )
+                return out_pathname
+
+            # per-tile calibration applications - fresh instances as all run connected
+            cal_apps = []
+            for image in images:
+
+                app = otbApplication.Registry.CreateApplication( 'OpticalCalibration' )
+
+                app.SetParameterString( 'in', image )
+                app.SetParameterString( 'level', level )
+                app.SetParameterValue( 'milli', milli )
+
+                cal_apps.append( app )
+
+            # initialise tile fusion application
+            tile_fusion = self._app( 'TileFusion' )
+
+            tile_fusion.SetParameterInt( 'cols', ncols )
+            tile_fusion.SetParameterInt( 'rows', nrows )
+            tile_fusion.SetParameterString( 'out', _out( out_pathname ) )
+            tile_fusion.SetParameterInt( 'ram', self._ram )
+
+            # connect calibrated tiles in memory - mosaic write triggers whole pipeline
+            with _LogRedirect( self._log_pathname ):
+
+                for app in cal_apps:
+
+                    app.Execute()
+                    tile_fusion.AddImageToParameterInputImageList( 'il', app.GetParameterOutputImage( 'out' ) )
+
+                tile_fusion.ExecuteAndWriteOutput()
+
+            # publish result into calibration cache
+            os.makedirs( os.path.dirname( cache_pathname ), exist_ok=True )
+            _linkFile( out_pathname, cache_pathname )
+
+        return out_pathname
+
+
+    def getTileFusionImages( self, images, out_path ):
+
+        """
+        fuse image tiles into single mosaic with otb tile fusion application
+        """
+
+        # parse tile coordinates in single regex pass
+        tiles = [ ( int( m.group( 1 ) ), int( m.group( 2 ) ), image ) for image in images for m in [ _TILE_RE.search( os.path.basename( image ) ) ] if m ]
+
+        # grid dimensions and row major order from parsed indices
+        nrows = max( tile[ 0 ] for tile in tiles )
+        ncols = max( tile[ 1 ] for tile in tiles )
+
+        images = [ tile[ 2 ] for tile in sorted( tiles ) ]
+
+        # create out path if required
+        os.makedirs( out_path, exist_ok=True )
+
+        # construct mosaic image pathname
+        out_pathname = self.getMosaicPathname( images, out_path )
+        if not os.path.exists( out_pathname ):
+
+            # initialise tile fusion application
+            app = self._app( 'TileFusion' )
+
+            app.SetParameterStringList( 'il', images )
+            app.SetParameterInt( 'cols', ncols )
+            app.SetParameterInt( 'rows', nrows )
+            app.SetParameterString( 'out', _out( out_pathname ) )
+            app.SetParameterInt( 'ram', self._ram )
+
+            # execute application with output redirected to log
+            with _LogRedirect( self._log_pathname ):
+                app.ExecuteAndWriteOutput()
+
+        return out_pathname
+
+
+    def getRoiImages( self, images, out_path ):
+
+        """
+        extract roi sub-images for each band mosaic
+        """
+
+        return { _id: self.getRoiImage( image, out_path ) for _id, image in images.items() }
+
+
+    def getRoiImage( self, image, out_path ):
+
+        """
+        extract roi sub-image with otb extract roi application
+        """
+
+        out_pathname = image
+
+        # compute roi intersection in image coordinates
+        coords = self._roi.getImageRoi( image )
+        if coords is not None:
+
+            # create out path if required
+            os.makedirs( out_path, exist_ok=True )
+
+            # construct roi image pathname
+            stem, ext = os.path.splitext( os.path.basename( image ) )
+            out_pathname = os.path.join( out_path, f'{stem}_ROI{ext}' )
+            if not os.path.exists( out_pathname ):
+
+                # initialise extract roi application
+                app = self._app( 'ExtractROI' )
+
+                app.SetParameterString( 'in', image )
+                app.SetParameterInt( 'startx', coords[ 0 ] )
+                app.SetParameterInt( 'starty', coords[ 1 ] )
+                app.SetParameterInt( 'sizex', coords[ 2 ] - coords[ 0 ] )
+                app.SetParameterInt( 'sizey', coords[ 3 ] - coords[ 1 ] )
+                app.SetParameterString( 'out', _out( out_pathname ) )
+                app.SetParameterInt( 'ram', self._ram )
+
+                # execute application with output redirected to log
+                with _LogRedirect( self._log_pathname ):
+                    app.ExecuteAndWriteOutput()
+
+        return out_pathname
+
+
+    def getSuperimposedImage( self, images, out_path ):
+
+        """
+        resample multispectral mosaic onto panchromatic grid with otb superimpose application
+        """
+
+        # create out path if required
+        os.makedirs( out_path, exist_ok=True )
+
+        # construct superimposed image pathname
+        stem, ext = os.path.splitext( os.path.basename( images[ 'MS' ] ) )
+        out_pathname = os.path.join( out_path, f'{stem}_SUPER_{ext}' )
+        if not os.path.exists( out_pathname ):
+
+            # initialise superimpose application
+            app = self._app( 'Superimpose' )
+
+            app.SetParameterString( 'inr', images[ 'P' ] )
+            app.SetParameterString( 'inm', images[ 'MS' ] )
+            app.SetParameterString( 'elev.dem', self._dem_path )
+            app.SetParameterString( 'elev.geoid', self._geoid_pathname )
+            app.SetParameterString( 'out', _out( out_pathname ) )
+            app.SetParameterInt( 'ram', self._ram )
+
+            # execute application with output redirected to log
+            with _LogRedirect( self._log_pathname ):
+                app.ExecuteAndWriteOutput()
+
+        return out_pathname
+
+
+    def getPansharpenImage( self, images, out_path ):
+
+        """
+        pansharpen multispectral mosaic with otb pansharpening application
+        """
+
+        # create out path if required
+        os.makedirs( out_path, exist_ok=True )
+
+        # construct pansharpened image pathname
+        stem, ext = os.path.splitext( os.path.basename( images[ 'P' ] ) )
+        out_pathname = os.path.join( out_path, f'{stem}_PXS{ext}' )
+
+        if not os.path.exists( out_pathname ):
+
+            # initialise pansharpening application
+            app = self._app( 'Pansharpening' )
+
+            app.SetParameterString( 'inp', images[ 'P' ] )
+            app.SetParameterString( 'inxs', images[ 'MS' ] )
+            app.SetParameterString( 'out', _out( out_pathname ) )
+            app.SetParameterInt( 'ram', self._ram )
+
+            # execute application with output redirected to log
+            with _LogRedirect( self._log_pathname ):
+                app.ExecuteAndWriteOutput()
+
+        return out_pathname
+
+
+    def getSuperimposedPansharpenImage( self, images, out_path ):
+
+        """
+        superimpose and pansharpen in single in-memory otb pipeline
+        """
+
+        # create out path if required
+        os.makedirs( out_path, exist_ok=True )
+
+        # construct pansharpened image pathname
+        stem, ext = os.path.splitext( os.path.basename( images[ 'P' ] ) )
+        out_pathname = os.path.join( out_path, f'{stem}_PXS{ext}' )
+
+        if not os.path.exists( out_pathname ):
+
+            # initialise superimpose application without writing output
+            super_app = self._app( 'Superimpose' )
+
+            super_app.SetParameterString( 'inr', images[ 'P' ] )
+            super_app.SetParameterString( 'inm', images[ 'MS' ] )
+            super_app.SetParameterString( 'elev.dem', self._dem_path )
+            super_app.SetParameterString( 'elev.geoid', self._geoid_pathname )
+            super_app.SetParameterInt( 'ram', self._ram )
+
+            # initialise pansharpening application
+            app = self._app( 'Pansharpening' )
+
+            app.SetParameterString( 'inp', images[ 'P' ] )
+            app.SetParameterString( 'out', _out( out_pathname ) )
+            app.SetParameterInt( 'ram', self._ram )
+
+            # execute connected pipeline - resampled mosaic never hits disk
+            with _LogRedirect( self._log_pathname ):
+
+                super_app.Execute()
+                app.ConnectImage( 'inxs', super_app, 'out' )
+                app.ExecuteAndWriteOutput()
+
+        return out_pathname
+
+
+    def getPansharpenImage_Bundle( self, images, out_path ):
+
+        """
+        orthorectify and pansharpen bundle with otb bundle to perfect sensor application
+        """
+
+        # create out path if required
+        os.makedirs( out_path, exist_ok=True )
+
+        # construct pansharpened image pathname
+        stem, ext = os.path.splitext( os.path.basename( images[ 'P' ] ) )
+        out_pathname = os.path.join( out_path, f'{stem}_PXS{ext}' )
+
+        if not os.path.exists( out_pathname ):
+
+            # initialise bundle to perfect sensor application
+            app = self._app( 'BundleToPerfectSensor' )
+
+            app.SetParameterString( 'inp', images[ 'P' ] )
+            app.SetParameterString( 'inxs', images[ 'MS' ] )
+            app.SetParameterString( 'elev.dem', self._dem_path )
+            app.SetParameterString( 'elev.geoid', self._geoid_pathname )
+            app.SetParameterString( 'out', _out( out_pathname ) )
+            app.SetParameterInt( 'ram', self._ram )
+
+            # execute application with output redirected to log
+            with _LogRedirect( self._log_pathname ):
+                app.ExecuteAndWriteOutput()
+
+        return out_pathname
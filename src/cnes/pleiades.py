@@ -0,0 +1,58 @@
+import os
+import re
+import concurrent.futures
+
+from dataset import Dataset
+
+
+class Pleiades( Dataset ):
+
+    def __init__( self, scene, **kwargs ):
+
+        """
+        constructor
+        """
+
+        # compile platform specific naming pattern once
+        self._platform_pattern = re.compile( 'PHR1[AB]' )
+
+        # initialise base object
+        super().__init__( scene, **kwargs )
+        self._platform = self.getPlatform( os.path.basename( scene ) )
+
+        return
+
+
+    def processToArd( self ):
+
+        """
+        process raw scene into analysis ready pansharpened image
+        """
+
+        # extract scene archive into temporary path
+        tmp_path = self.getTmpPath()
+        self.extractZip( tmp_path )
+
+        # locate multispectral and panchromatic imagery
+        images = self.getImageLists( tmp_path )
+
+        # overlap srtm download with per-band calibration and mosaicking
+        with concurrent.futures.ThreadPoolExecutor( max_workers=3 ) as executor:
+
+            srtm_future = executor.submit( self.getSrtmTiles, images[ 'P' ] + images[ 'MS' ] )
+            futures = { _id: executor.submit( self.getBandMosaicImage, images[ _id ], tmp_path ) for _id in [ 'MS', 'P' ] }
+
+            # surface stage exceptions before continuing to pansharpen
+            done, _ = concurrent.futures.wait( [ srtm_future ] + list( futures.values() ) )
+            for future in done:
+                future.result()
+
+            mosaic = { _id: futures[ _id ].result() for _id in futures }
+
+        # optionally extract roi sub-images in single pass
+        if self._roi is not None:
+            mosaic = self.getRoiImages( mosaic, os.path.join( tmp_path, 'roi' ) )
+
+        # superimpose and pansharpen in single in-memory pipeline
+        out_path = os.path.join( os.path.dirname( self._scene ), 'ard' )
+        return self.getSuperimposedPansharpenImage( mosaic, out_path )
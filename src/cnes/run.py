@@ -0,0 +1,101 @@
+import os
+import argparse
+import tempfile
+import concurrent.futures
+
+from spot import Spot
+from pleiades import Pleiades
+
+
+def getDataset( scene, **kwargs ):
+
+    """
+    create platform specific dataset object
+    """
+
+    obj = None
+
+    # identify platform from scene name
+    if 'PHR' in os.path.basename( scene ):
+        obj = Pleiades( scene, **kwargs )
+
+    if 'SPOT' in os.path.basename( scene ):
+        obj = Spot( scene, **kwargs )
+
+    return obj
+
+
+def processScenes( scenes, **kwargs ):
+
+    """
+    process scene collection through shared orchestration pipeline
+    """
+
+    out_pathnames = []
+
+    # platform grouping keeps cached otb applications warm between scenes
+    objs = [ getDataset( scene, **kwargs ) for scene in scenes ]
+    objs = sorted( ( obj for obj in objs if obj is not None ), key=lambda obj: type( obj ).__name__ )
+
+    if objs:
+
+        # extract archives and gather image lists up front
+        with concurrent.futures.ThreadPoolExecutor( max_workers=min( len( objs ), os.cpu_count() ) ) as executor:
+            image_lists = list( executor.map( lambda obj: obj.getImageLists( obj.extractZip( obj.getTmpPath() ) ), objs ) )
+
+        # prefetch srtm tiles covering union of scene footprints in one call
+        union = [ image for images in image_lists for image in images[ 'P' ] + images[ 'MS' ] ]
+        objs[ 0 ].getSrtmTiles( union )
+
+        # per-scene download requests now satisfied
+        for obj, images in zip( objs, image_lists ):
+            obj.markSrtmTiles( images[ 'P' ] + images[ 'MS' ] )
+
+        # descriptor redirect is process wide - concurrent scenes share one batch log
+        log_pathname = os.path.join( tempfile.gettempdir(), 'gla-ard-batch.log' )
+        for obj in objs:
+            obj.setLogPathname( log_pathname )
+
+        # process scenes pairwise - calibration of one overlaps pansharpen of another
+        with concurrent.futures.ThreadPoolExecutor( max_workers=2 ) as executor:
+            out_pathnames = list( executor.map( lambda obj: obj.processToArd(), objs ) )
+
+    return out_pathnames
+
+
+def parseArguments(args=None):
+
+    """
+    parse command line arguments
+    """
+
+    # parse command line arguments
+    parser = argparse.ArgumentParser(description='process-to-ard')
+    parser.add_argument( 'scenes', nargs='+', action="store" )
+    parser.add_argument( '-dem_path', default=None, action="store" )
+    parser.add_argument( '-geoid_pathname', default=None, action="store" )
+    parser.add_argument( '-roi', nargs=4, default=None, type=float )
+
+    return parser.parse_args(args)
+
+
+def main():
+
+    """
+    main path of execution
+    """
+
+    # parse arguments
+    args = parseArguments()
+
+    # process scenes to ard through shared pipeline
+    out_pathnames = processScenes( args.scenes, dem_path=args.dem_path, geoid_pathname=args.geoid_pathname, roi=args.roi )
+    for out_pathname in out_pathnames:
+        print ( 'ard image: {}'.format( out_pathname ) )
+
+    return
+
+
+# execute main
+if __name__ == '__main__':
+    main()